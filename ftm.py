@@ -12,13 +12,12 @@ import os
 import shutil
 import subprocess
 import sys
-import json
-import urllib.request
-import urllib.error
+import threading
 import time
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 
 # --- Configuration Constants ---
 APP_NAME = "Fastfetch Theme Manager"
@@ -27,6 +26,18 @@ CONFIG_DIR = Path.home() / ".config/fastfetch"
 CONFIG_FILE = CONFIG_DIR / "config.jsonc"
 USER_THEMES_DIR = Path.home() / ".local/share/fastfetch/themes"
 BACKUP_DIR = Path.home() / ".local/share/fastfetch/backups"
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "ftm"
+DATA_PATHS_CACHE = CACHE_DIR / "datapaths"
+# Environment that `fastfetch --list-data-paths` output depends on
+_DATA_PATHS_ENV = ("XDG_CONFIG_HOME", "XDG_CONFIG_DIRS", "XDG_DATA_HOME", "XDG_DATA_DIRS")
+
+# Common preset locations, relative to each fastfetch data path
+_PRESET_SUBDIRS = ("presets", "fastfetch/presets")
+_FALLBACK_PRESET_DIRS = (
+    Path("/usr/share/fastfetch/presets"),
+    Path("/usr/share/fastfetch/fastfetch/presets"),
+    Path.home() / ".local/share/fastfetch/presets"
+)
 
 # --- ANSI Colors & Styles ---
 class Style:
@@ -72,12 +83,18 @@ class ThemeEntry:
 # 🛠️ UTILITIES & SAFETY
 # =============================================================
 
+_dirs_ensured = False
+
 def ensure_dirs():
-    """Creates necessary directories safely."""
+    """Creates necessary directories safely (once per run)."""
+    global _dirs_ensured
+    if _dirs_ensured:
+        return
     try:
         CONFIG_DIR.mkdir(parents=True, exist_ok=True)
         USER_THEMES_DIR.mkdir(parents=True, exist_ok=True)
         BACKUP_DIR.mkdir(parents=True, exist_ok=True)
+        _dirs_ensured = True
     except OSError as e:
         Style.error(f"Permission denied creating directories: {e}")
         sys.exit(1)
@@ -88,9 +105,9 @@ def backup_config():
         timestamp = int(time.time())
         backup_path = BACKUP_DIR / f"config_{timestamp}.jsonc"
         try:
-            shutil.copy2(CONFIG_FILE, backup_path)
-            # Keep only last 10 backups
-            backups = sorted(BACKUP_DIR.glob("config_*.jsonc"), key=os.path.getmtime)
+            shutil.copyfile(CONFIG_FILE, backup_path)
+            # Keep only last 10 backups (fixed-width timestamps sort by name)
+            backups = sorted(BACKUP_DIR.glob("config_*.jsonc"), key=lambda p: p.name)
             while len(backups) > 10:
                 backups.pop(0).unlink()
         except Exception:
@@ -98,14 +115,14 @@ def backup_config():
 
 def restore_backup():
     """Restores the most recent backup."""
-    backups = sorted(BACKUP_DIR.glob("config_*.jsonc"), key=os.path.getmtime, reverse=True)
+    backups = sorted(BACKUP_DIR.glob("config_*.jsonc"), key=lambda p: p.name, reverse=True)
     if not backups:
         Style.error("No backups found to restore.")
         return
     
     latest = backups[0]
     try:
-        shutil.copy2(latest, CONFIG_FILE)
+        shutil.copyfile(latest, CONFIG_FILE)
         Style.success(f"Restored configuration from {latest.name}")
     except Exception as e:
         Style.error(f"Failed to restore backup: {e}")
@@ -131,10 +148,8 @@ def check_dependencies():
         "fastfetch": "Required to display system info.",
         "fzf": "Required for the interactive picker."
     }
-    missing = []
-    for dep, reason in deps.items():
-        if not shutil.which(dep):
-            missing.append(dep)
+    managers = ("apt", "pacman", "dnf", "brew")
+    missing = [dep for dep in deps if not shutil.which(dep)]
     
     if missing:
         Style.warning("Missing Dependencies:")
@@ -142,10 +157,7 @@ def check_dependencies():
             print(f"  - {Style.BOLD}{m}{Style.RESET}: {deps[m]}")
         
         # Smart Install Suggestion
-        mgr = "apt" if shutil.which("apt") else \
-              "pacman" if shutil.which("pacman") else \
-              "dnf" if shutil.which("dnf") else \
-              "brew" if shutil.which("brew") else None
+        mgr = next((m for m in managers if shutil.which(m)), None)
 
         if mgr:
             cmd = ""
@@ -162,72 +174,150 @@ def check_dependencies():
 # 🔍 THEME DISCOVERY
 # =============================================================
 
+def _cached_data_paths() -> Optional[str]:
+    """Returns `fastfetch --list-data-paths` output, reusing the on-disk cache
+    while it was produced by the same fastfetch install under the same XDG
+    environment."""
+    exe = shutil.which("fastfetch")
+    if not exe:
+        return None
+
+    # Package managers keep archive mtimes, so identify the install by path,
+    # size and ctime rather than trusting "newer than" comparisons
+    ident = [exe]
+    for p in (Path(exe), Path("/usr/share/fastfetch")):
+        try:
+            st = p.stat()
+            ident.append(f"{st.st_mtime_ns}:{st.st_ctime_ns}:{st.st_size}")
+        except OSError:
+            ident.append("-")
+    ident += [f"{k}={os.environ.get(k, '')}" for k in _DATA_PATHS_ENV]
+    header_line = "# " + ";".join(ident)
+
+    try:
+        header, _, cached = DATA_PATHS_CACHE.read_text().partition("\n")
+        if header == header_line:
+            return cached
+    except OSError:
+        pass
+
+    proc = subprocess.run([exe, "--list-data-paths"], capture_output=True, text=True)
+    if proc.returncode != 0:
+        return None
+
+    # Atomic write so concurrent runs never see a partial cache
+    tmp = DATA_PATHS_CACHE.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(f"{header_line}\n{proc.stdout}")
+        os.replace(tmp, DATA_PATHS_CACHE)
+    except OSError:
+        # Cache is best-effort, but never leave the temp file behind
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+    return proc.stdout
+
+# Set by main() for `list`/`pick` via --user-only or FTM_USER_ONLY
+_user_only = False
+
+def env_flag(name: str) -> bool:
+    """True only for explicit truthy values ("1", "true", "yes")."""
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes")
+
+@lru_cache(maxsize=None)
 def get_fastfetch_presets() -> List[Path]:
-    """Smartly finds where fastfetch stores its presets."""
-    # 1. Ask fastfetch
+    """Smartly finds where fastfetch stores its presets (once per run)."""
+    # 0. User themes only: skip probing fastfetch entirely
+    if _user_only:
+        return []
+
+    # 1. Ask fastfetch (cached on disk)
     try:
-        proc = subprocess.run(["fastfetch", "--list-data-paths"], capture_output=True, text=True)
-        if proc.returncode == 0:
-            paths = [Path(p.strip()) for p in proc.stdout.splitlines() if p.strip()]
+        out = _cached_data_paths()
+        if out is not None:
+            lines = (s.strip() for s in out.splitlines())
             valid = []
-            for p in paths:
-                # Common preset locations
-                if (p / "presets").exists(): valid.append(p / "presets")
-                if (p / "fastfetch/presets").exists(): valid.append(p / "fastfetch/presets")
+            for p in map(Path, filter(None, lines)):
+                for sub in _PRESET_SUBDIRS:
+                    if (p / sub).is_dir(): valid.append(p / sub)
             if valid: return valid
     except:
         pass
 
     # 2. Fallbacks
-    candidates = [
-        Path("/usr/share/fastfetch/presets"),
-        Path("/usr/share/fastfetch/fastfetch/presets"),
-        Path.home() / ".local/share/fastfetch/presets"
-    ]
-    return [p for p in candidates if p.exists()]
+    return [p for p in _FALLBACK_PRESET_DIRS if p.exists()]
 
+_JSONC = ".jsonc"
+
+def scan_jsonc(directory: Path) -> List[Tuple[str, Path]]:
+    """Lists (stem, path) for *.jsonc files in a directory (unordered; callers sort once)."""
+    try:
+        with os.scandir(directory) as it:
+            return [(e.name[:-len(_JSONC)], Path(e.path))
+                    for e in it if e.name.endswith(_JSONC) and e.is_file()]
+    except OSError:
+        return []
+
+@lru_cache(maxsize=None)
 def list_themes() -> List[ThemeEntry]:
-    """Scans system and user directories for themes."""
-    entries = []
+    """Scans system and user directories for themes (once per run)."""
+    # Deduplicated while scanning: the first directory to provide a key wins
+    unique_map: Dict[str, ThemeEntry] = {}
     
     # System Presets
     preset_dirs = get_fastfetch_presets()
     for d in preset_dirs:
         # Root presets
-        for f in d.glob("*.jsonc"):
-            entries.append(ThemeEntry(f.stem, "System", f))
+        for stem, path in scan_jsonc(d):
+            if stem not in unique_map:
+                unique_map[stem] = ThemeEntry(stem, "System", path)
         # Example presets
-        for f in (d / "examples").glob("*.jsonc"):
-            entries.append(ThemeEntry(f"examples/{f.stem}", "Example", f))
+        for stem, path in scan_jsonc(d / "examples"):
+            key = f"examples/{stem}"
+            if key not in unique_map:
+                unique_map[key] = ThemeEntry(key, "Example", path)
 
     # User Themes
-    if USER_THEMES_DIR.exists():
-        for f in USER_THEMES_DIR.glob("*.jsonc"):
-            entries.append(ThemeEntry(f"user/{f.stem}", "User", f))
-            
-    # Deduplicate (prefer User > Example > System)
-    unique_map = {}
-    for e in entries:
-        if e.key not in unique_map:
-            unique_map[e.key] = e
+    for stem, path in scan_jsonc(USER_THEMES_DIR):
+        key = f"user/{stem}"
+        unique_map[key] = ThemeEntry(key, "User", path)
     
     return sorted(unique_map.values(), key=lambda x: x.key)
 
+@lru_cache(maxsize=None)
+def theme_index() -> Tuple[Dict[str, ThemeEntry], Dict[str, ThemeEntry], List[Tuple[str, ThemeEntry]]]:
+    """Builds (by_key, by_short_name, lowered_keys) lookups over list_themes()."""
+    by_key: Dict[str, ThemeEntry] = {}
+    by_short: Dict[str, ThemeEntry] = {}
+    lowered: List[Tuple[str, ThemeEntry]] = []
+    for t in list_themes():
+        by_key[t.key] = t
+        lowered.append((t.key.lower(), t))
+        # "examples/foo" and "user/foo" are also reachable as "foo";
+        # the first in sorted order wins, as with the old suffix scan
+        if "/" in t.key:
+            by_short.setdefault(t.key.rpartition("/")[2], t)
+    return by_key, by_short, lowered
+
+def refresh_themes():
+    """Drops cached theme listings after themes are added on disk."""
+    list_themes.cache_clear()
+    theme_index.cache_clear()
+
 def resolve_theme(name: str) -> Optional[ThemeEntry]:
     """Finds a theme by fuzzy name or exact match."""
-    themes = list_themes()
-    
-    # Exact match
-    for t in themes:
-        if t.key == name: return t
+    by_key, by_short, lowered = theme_index()
     
-    # Partial match (suffix)
-    for t in themes:
-        if t.key.endswith(f"/{name}"): return t
+    # Exact match, then partial match (suffix)
+    entry = by_key.get(name) or by_short.get(name)
+    if entry: return entry
         
     # Loose match
-    for t in themes:
-        if name.lower() in t.key.lower(): return t
+    name_lower = name.lower()
+    for key_lower, t in lowered:
+        if name_lower in key_lower: return t
         
     return None
 
@@ -253,6 +343,8 @@ def ask_choice(prompt: str, options: List[str]) -> str:
 
 def build_theme():
     """Interactive wizard to generate a config file."""
+    import json
+
     Style.print_header("✨ Interactive Theme Builder ✨")
     
     # --- Step 1: Logo ---
@@ -335,8 +427,8 @@ def build_theme():
     out_path = USER_THEMES_DIR / name
     
     try:
-        with open(out_path, "w") as f:
-            json.dump(config, f, indent=4)
+        out_path.write_text(json.dumps(config, indent=4), encoding="utf-8")
+        refresh_themes()
         Style.success(f"Theme saved to {out_path}")
         
         if input("\nSet as default now? [y/N] ").lower() == 'y':
@@ -365,17 +457,20 @@ def apply_theme(path_str: str):
     backup_config()
     
     try:
-        shutil.copy2(target, CONFIG_FILE)
+        shutil.copyfile(target, CONFIG_FILE)
         Style.success(f"Applied theme: {target.name}")
         
-        # Validation Check
+        # Validation Check: a single run both validates and renders to the terminal
         print(f"{Style.DIM}Validating...{Style.RESET}")
-        if not run_command(["fastfetch", "--config", str(CONFIG_FILE)], verbose=False):
+        try:
+            ok = subprocess.run(["fastfetch", "--config", str(CONFIG_FILE)]).returncode == 0
+        except FileNotFoundError:
+            ok = False
+
+        if not ok:
             Style.warning("Theme applied, but Fastfetch reported errors/warnings.")
             if input("Revert to previous? [y/N] ").lower() == 'y':
                 restore_backup()
-        else:
-            run_command(["fastfetch"])
             
     except Exception as e:
         Style.error(f"Critical error applying theme: {e}")
@@ -394,7 +489,7 @@ def run_fzf_picker():
         return
 
     # Prepare input for fzf
-    input_str = "\n".join([f"{t.key}\t{t.origin}\t{t.path}" for t in themes])
+    input_str = "\n".join(f"{t.key}\t{t.origin}\t{t.path}" for t in themes)
     
     # FZF Command with Preview
     preview_cmd = "fastfetch --config {3} --structure title:os:kernel:uptime:memory:break:colors"
@@ -410,8 +505,8 @@ def run_fzf_picker():
     ]
 
     try:
-        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
-        stdout, _ = proc.communicate(input=input_str)
+        result = subprocess.run(cmd, input=input_str, stdout=subprocess.PIPE, text=True)
+        stdout = result.stdout
         
         if stdout.strip():
             selected = stdout.split("\t")[0]
@@ -434,29 +529,97 @@ def reset_to_defaults():
     else:
         Style.error("Failed to generate default config.")
 
+_http_local = threading.local()
+
+MAX_REDIRECTS = 5
+
+@lru_cache(maxsize=None)
+def _https_only_opener():
+    """urllib opener (used behind proxies) that refuses redirects off https."""
+    import urllib.request
+
+    class HttpsOnlyRedirectHandler(urllib.request.HTTPRedirectHandler):
+        def redirect_request(self, req, fp, code, msg, headers, newurl):
+            if not newurl.startswith("https://"):
+                raise OSError(f"Refusing non-https redirect: {newurl}")
+            return super().redirect_request(req, fp, code, msg, headers, newurl)
+
+    return urllib.request.build_opener(HttpsOnlyRedirectHandler)
+
+def http_get(url: str, headers: Optional[Dict[str, str]] = None, _redirects: int = 0) -> bytes:
+    """GETs an https URL, reusing a keep-alive connection per host and thread.
+    Falls back to urllib when a proxy applies, so proxy settings are honoured."""
+    import http.client
+    import urllib.parse
+    import urllib.request
+
+    parts = urllib.parse.urlsplit(url)
+    if parts.scheme != "https":
+        raise OSError(f"Refusing non-https URL: {url}")
+    hdrs = {"User-Agent": "ftm-cli", **(headers or {})}
+
+    # Proxied: let urllib handle CONNECT, auth and its own redirect limit
+    if "https" in urllib.request.getproxies() and not urllib.request.proxy_bypass(parts.hostname or ""):
+        with _https_only_opener().open(urllib.request.Request(url, headers=hdrs), timeout=30) as r:
+            return r.read()
+
+    conns = getattr(_http_local, "conns", None)
+    if conns is None:
+        conns = _http_local.conns = {}
+    conn = conns.get(parts.netloc)
+    if conn is None:
+        conn = conns[parts.netloc] = http.client.HTTPSConnection(parts.netloc, timeout=30)
+
+    target = parts.path + (f"?{parts.query}" if parts.query else "")
+    try:
+        conn.request("GET", target, headers=hdrs)
+        resp = conn.getresponse()
+    except (http.client.RemoteDisconnected, http.client.BadStatusLine,
+            ConnectionResetError, BrokenPipeError):
+        # The server may have dropped an idle connection; retry once fresh
+        conn.close()
+        conn.request("GET", target, headers=hdrs)
+        resp = conn.getresponse()
+
+    body = resp.read()
+    if resp.status in (301, 302, 307, 308) and resp.getheader("Location"):
+        if _redirects >= MAX_REDIRECTS:
+            raise OSError(f"Too many redirects for {url}")
+        location = urllib.parse.urljoin(url, resp.getheader("Location"))
+        return http_get(location, headers, _redirects + 1)
+    if resp.status != 200:
+        raise OSError(f"HTTP {resp.status} {resp.reason} for {url}")
+    return body
+
+def _download_one(target):
+    """Fetches a single (url, dest) pair for pull_themes."""
+    url, dest = target
+    dest.write_bytes(http_get(url))
+    return dest.name
+
 def pull_themes(repo="itz-dev-tasavvuf/fastfetch-theme-manager", path="themes"):
     """Downloads themes without 'requests' library."""
+    # Imported here so commands that never touch the network start faster
+    import json
+    from concurrent.futures import ThreadPoolExecutor
+
     ensure_dirs()
     url = f"https://api.github.com/repos/{repo}/contents/{path}"
     
     Style.info(f"Connecting to GitHub ({repo})...")
     
     try:
-        req = urllib.request.Request(url, headers={"User-Agent": "ftm-cli"})
-        with urllib.request.urlopen(req) as resp:
-            data = json.loads(resp.read().decode())
+        data = json.loads(http_get(url, {"Accept": "application/vnd.github+json"}).decode())
             
-        count = 0
-        for item in data:
-            if item["name"].endswith(".jsonc"):
-                raw_url = item["download_url"]
-                dest = USER_THEMES_DIR / item["name"]
-                print(f"  ⬇️  Downloading {item['name']}...")
-                with urllib.request.urlopen(raw_url) as r, open(dest, "wb") as f:
-                    f.write(r.read())
-                count += 1
-                
-        Style.success(f"Downloaded {count} themes to {USER_THEMES_DIR}")
+        targets = [(i["download_url"], USER_THEMES_DIR / i["name"])
+                   for i in data if i["name"].endswith(".jsonc")]
+        # Downloads are independent and network-bound, so fetch them concurrently
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            for name in ex.map(_download_one, targets):
+                print(f"  ⬇️  Downloaded {name}")
+
+        refresh_themes()
+        Style.success(f"Downloaded {len(targets)} themes to {USER_THEMES_DIR}")
         
     except Exception as e:
         Style.error(f"Download failed: {e}")
@@ -467,11 +630,14 @@ def pull_themes(repo="itz-dev-tasavvuf/fastfetch-theme-manager", path="themes"):
 # =============================================================
 
 def main():
+    global _user_only
     parser = argparse.ArgumentParser(description="Fastfetch Theme Manager (FTM)")
     subparsers = parser.add_subparsers(dest="command", required=True)
 
-    subparsers.add_parser("list", help="List all available themes")
-    subparsers.add_parser("pick", help="Interactive theme picker (fzf)")
+    list_parser = subparsers.add_parser("list", help="List all available themes")
+    list_parser.add_argument("--user-only", action="store_true", help="Only show user themes")
+    pick_parser = subparsers.add_parser("pick", help="Interactive theme picker (fzf)")
+    pick_parser.add_argument("--user-only", action="store_true", help="Only show user themes")
     subparsers.add_parser("build", help="Create a new theme interactively")
     subparsers.add_parser("reset", help="Reset configuration to defaults")
     
@@ -488,6 +654,10 @@ def main():
 
     args = parser.parse_args()
 
+    # User-only mode only narrows browsing; `set` still sees every theme
+    if args.command in ("list", "pick"):
+        _user_only = args.user_only or env_flag("FTM_USER_ONLY")
+
     # Pre-flight check
     ensure_dirs()
     if args.command != "list": 